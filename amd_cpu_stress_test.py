@@ -1,21 +1,68 @@
 import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
 import psutil
 import time
 import argparse
+import ctypes
+import glob
 import os
+import shutil
+import signal
 import sys
+import traceback
 from datetime import datetime
+from typing import List
+
+# Fixed warmup after starting the workers before the countdown begins, in seconds
+WARMUP_SECONDS = 2.0
+
+# Length of one busy/idle duty cycle in nanoseconds
+CONTROL_CYCLE_NS = 10_000_000
+
+# Target duration of one burn slice in seconds; must be well below the control cycle
+BURN_SLICE_SECONDS = 0.001
+
+# Largest NumPy work buffer in float64 elements (8 MB per worker without Numba)
+MAX_WORK_ELEMENTS = 10**6
+
+# Log file buffer size in bytes; flushes are driven by LOG_FLUSH_INTERVAL
+LOG_BUFFER_SIZE = 65536
+
+# Minimum interval between log file flushes in seconds
+LOG_FLUSH_INTERVAL = 2.0
+
+# Fixed part of the status line, filled with str.format_map once per tick
+STATUS_TEMPLATE = "\r[{bar}] | Current: {current:.1f}% | Target: {target:.1f}%"
+
+# Persist compiled kernels so every worker process loads them instead of re-JITting
+os.environ.setdefault('NUMBA_CACHE_DIR',
+                      os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__', 'numba'))
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # Fall back to the NumPy kernel
 
 class Logger:
     """Logger class to handle both console and file output"""
     def __init__(self, log_file):
         self.terminal = sys.stdout
-        self.log_file = open(log_file, 'w', encoding='utf-8')
+        self.log_file = open(log_file, 'w', buffering=LOG_BUFFER_SIZE, encoding='utf-8')
+        self._last_flush = time.monotonic()
     
     def write(self, message):
         self.terminal.write(message)
+        self.write_log(message)
+    
+    def write_log(self, message):
+        """Write a message to the log file only"""
         self.log_file.write(message)
-        self.log_file.flush()
+        # Flush on a coarse cadence instead of after every status update
+        now = time.monotonic()
+        if now - self._last_flush > LOG_FLUSH_INTERVAL:
+            self.log_file.flush()
+            self._last_flush = now
     
     def flush(self):
         self.terminal.flush()
@@ -24,16 +71,30 @@ class Logger:
     def close(self):
         self.log_file.close()
 
-def print_cpu_status(cpu_cores: list, cpu_percent: list, target_percent: float, 
-                    remaining_time: float = None):
+def build_core_status_format(cpu_cores: list) -> str:
+    """
+    Build the per-core part of the status line as a single format string
+    
+    Args:
+        cpu_cores: List of CPU cores being tested
+        
+    Returns:
+        str: Format string taking one utilization value per core, in order
+    """
+    return "".join(f" | Core {core}: {{:.1f}}%" for core in cpu_cores)
+
+def print_cpu_status(cpu_cores: list, cpu_percent: dict, target_percent: float, 
+                    remaining_time: float = None, stream=None, core_format: str = None):
     """
     Print current CPU status
     
     Args:
         cpu_cores: List of CPU cores being tested
-        cpu_percent: List of CPU utilization percentages
+        cpu_percent: Mapping of CPU core to utilization percentage
         target_percent: Target CPU utilization percentage
         remaining_time: Remaining test time in seconds (optional)
+        stream: Output stream (defaults to sys.stdout)
+        core_format: Precomputed result of build_core_status_format(cpu_cores) (optional)
     """
     # Calculate average usage for tested cores
     current_usage = sum(cpu_percent[core] for core in cpu_cores) / len(cpu_cores)
@@ -43,85 +104,504 @@ def print_cpu_status(cpu_cores: list, cpu_percent: list, target_percent: float,
     bar = "=" * progress + "-" * (20 - progress)
     
     # Build status string
-    status = [
-        f"\r[{bar}]",
-        f"Current: {current_usage:.1f}%",
-        f"Target: {target_percent:.1f}%"
-    ]
+    status = [STATUS_TEMPLATE.format_map({
+        'bar': bar,
+        'current': current_usage,
+        'target': target_percent
+    })]
     
-    # Add per-core statistics
-    core_stats = [f"Core {core}: {cpu_percent[core]:.1f}%" for core in cpu_cores]
-    status.extend(core_stats)
+    # Add per-core statistics in one format pass
+    if core_format is None:
+        core_format = build_core_status_format(cpu_cores)
+    status.append(core_format.format(*[cpu_percent[core] for core in cpu_cores]))
     
     # Add remaining time if provided
     if remaining_time is not None:
-        status.append(f"Time: {int(remaining_time)}s")
+        status.append(f" | Time: {int(remaining_time)}s")
     
-    # Print status
-    print(" | ".join(status), end="")
+    # Write the whole line at once
+    (stream or sys.stdout).write("".join(status))
 
-def get_cpu_topology():
+class StatusRenderer:
     """
-    Get CPU topology information including physical and logical cores
-    For AMD CPUs, this includes CCX (Core Complex) information if available
+    Real-time status display that only rewrites fields whose value changed
+    
+    On a terminal the first call draws a fixed scaffold (progress bar, overall
+    usage, remaining time and one cell per core) and later calls jump to each
+    changed field with ANSI cursor movement. Other outputs, and terminals too
+    narrow for the scaffold, get the classic single status line from
+    print_cpu_status(). When a logger is given, each sample is written to the
+    log file as one CSV row instead of the display.
+    """
+    # Width of one "Core NNN: XXX.X%" cell plus its " | " separator
+    CELL_WIDTH = 20
+    
+    def __init__(self, cpu_cores: list, target_percent: float, terminal, logger=None):
+        self.cpu_cores = cpu_cores
+        self.target_percent = target_percent
+        self.terminal = terminal
+        self.logger = logger
+        self.ansi = terminal.isatty()
+        self.fields = None  # Field name -> (rows above the saved cursor, column)
+        self.values = {}    # Field name -> last rendered text
+        self.csv_started = False
+        # Formats are fixed for the whole run, so build them once
+        self.core_format = build_core_status_format(cpu_cores)
+        self.csv_format = ",".join(["{:.1f}"] * (len(cpu_cores) + 3)) + "\n"
+        self.start_time = time.monotonic()
+    
+    def _draw_scaffold(self):
+        """Draw the static labels and remember where each dynamic field lives"""
+        fields = {}
+        line = "["
+        fields['bar'] = (0, len(line))
+        line += " " * 20 + "] | Current: "
+        fields['current'] = (0, len(line))
+        line += " " * 6 + f" | Target: {self.target_percent:5.1f}% | Time: "
+        fields['time'] = (0, len(line))
+        lines = [line + " " * 8]
+        
+        # Cursor movement counts screen rows, not logical lines, so nothing may wrap.
+        # A terminal too narrow for the header gets the plain status line instead
+        columns = shutil.get_terminal_size().columns
+        if len(lines[0]) > columns - 1:
+            self.ansi = False
+            return
+        
+        # Fit the core rows to the terminal, keeping the last column free
+        cores_per_row = max(1, (columns - 1 + 3) // self.CELL_WIDTH)
+        for start in range(0, len(self.cpu_cores), cores_per_row):
+            line = ""
+            for core in self.cpu_cores[start:start + cores_per_row]:
+                if line:
+                    line += " | "
+                line += f"Core {core:>3}: "
+                fields[core] = (len(lines), len(line))
+                line += " " * 6
+            lines.append(line)
+        
+        # Save the cursor just below the scaffold; every update returns there
+        self.terminal.write("\n" + "\n".join(lines) + "\n\x1b7")
+        self.fields = {name: (len(lines) - row, col) for name, (row, col) in fields.items()}
+    
+    def _write_csv_row(self, cpu_percent: dict, current_usage: float):
+        """Append one CSV row for this sample to the log file"""
+        if not self.csv_started:
+            self.csv_started = True
+            self.logger.write_log("\nelapsed_s,current,target," +
+                                  ",".join(f"core{core}" for core in self.cpu_cores) + "\n")
+        elapsed = time.monotonic() - self.start_time
+        self.logger.write_log(self.csv_format.format(elapsed, current_usage, self.target_percent,
+                                                     *[cpu_percent[core] for core in self.cpu_cores]))
+    
+    def render(self, cpu_percent: dict, current_usage: float, remaining_time: float = None):
+        """
+        Display one sample
+        
+        Args:
+            cpu_percent: Mapping of CPU core to utilization percentage
+            current_usage: Average utilization of the tested cores
+            remaining_time: Remaining test time in seconds (optional)
+        """
+        if self.logger is not None:
+            self._write_csv_row(cpu_percent, current_usage)
+        
+        if self.ansi and self.fields is None:
+            self._draw_scaffold()
+        
+        if not self.ansi:
+            print_cpu_status(self.cpu_cores, cpu_percent, self.target_percent,
+                             remaining_time, stream=self.terminal, core_format=self.core_format)
+            return
+        
+        progress = min(max(int(current_usage / 5), 0), 20)  # 20 segments for 100%
+        values = {
+            'bar': "=" * progress + "-" * (20 - progress),
+            'current': f"{current_usage:5.1f}%",
+            'time': f"{int(remaining_time):>7}s" if remaining_time is not None else " " * 8
+        }
+        for core in self.cpu_cores:
+            values[core] = f"{cpu_percent[core]:5.1f}%"
+        
+        # Only emit escape sequences for fields whose text changed
+        updates = []
+        for name, text in values.items():
+            if self.values.get(name) != text:
+                rows_up, col = self.fields[name]
+                updates.append(f"\x1b8\x1b[{rows_up}A\x1b[{col + 1}G{text}")
+        if updates:
+            updates.append("\x1b8")
+            self.terminal.write("".join(updates))
+            self.terminal.flush()
+        self.values = values
+
+class ProcStatReader:
+    """
+    Per-core CPU time sampler for the cores under test
+    
+    On Linux /proc/stat is kept open and re-read with a single preadv() into a
+    reused buffer, and only the lines of the requested cores are parsed.
+    Elsewhere it falls back to psutil.cpu_times(percpu=True).
+    """
+    def __init__(self, cpu_cores: list):
+        self.cpu_cores = frozenset(cpu_cores)
+        self.buf = bytearray(65536)
+        try:
+            self.fd = os.open('/proc/stat', os.O_RDONLY) if hasattr(os, 'preadv') else None
+        except OSError:
+            self.fd = None
+    
+    def sample(self):
+        """
+        Take a snapshot of CPU time counters
+        
+        Returns:
+            dict: Mapping of core index to (busy, total) CPU time
+        """
+        if self.fd is None:
+            all_times = psutil.cpu_times(percpu=True)
+            return {core: _busy_total(all_times[core]) for core in self.cpu_cores}
+        
+        # Grow the buffer if the per-core lines did not fit
+        size = os.preadv(self.fd, [self.buf], 0)
+        while size == len(self.buf):
+            self.buf = bytearray(len(self.buf) * 2)
+            size = os.preadv(self.fd, [self.buf], 0)
+        
+        # Per-core lines come right after the aggregate "cpu" line and before "intr"
+        end = self.buf.find(b'\nintr', 0, size)
+        counters = {}
+        for line in self.buf[:end if end >= 0 else size].split(b'\n')[1:]:
+            fields = line.split()
+            if not fields or not fields[0].startswith(b'cpu'):
+                break
+            core = int(fields[0][3:])
+            if core in self.cpu_cores:
+                # user nice system idle iowait irq softirq steal; guest is already in user/nice
+                times = [int(value) for value in fields[1:9]]
+                total = sum(times)
+                counters[core] = (total - times[3] - times[4], total)
+        return counters
+    
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+def read_worker_counters(counters: np.ndarray, cpu_cores: list):
+    """
+    Snapshot the busy/total time that each worker reports about itself
+    
+    Args:
+        counters: Shared (len(cpu_cores), 2) array of cumulative busy and total nanoseconds
+        cpu_cores: CPU cores in worker slot order
+        
+    Returns:
+        dict: Mapping of core index to (busy, total) nanoseconds
+    """
+    snapshot = counters.copy()
+    return {core: (snapshot[index, 0], snapshot[index, 1]) for index, core in enumerate(cpu_cores)}
+
+def get_cores_usage(before: dict, after: dict):
+    """
+    Compute utilization of each core between two (busy, total) snapshots
+    
+    Args:
+        before: Earlier snapshot from ProcStatReader.sample() or read_worker_counters()
+        after: Later snapshot from the same source
+        
+    Returns:
+        dict: Mapping of core index to utilization percentage
+    """
+    usage = {}
+    for core, (busy_end, total_end) in after.items():
+        busy_start, total_start = before[core]
+        total_delta = total_end - total_start
+        usage[core] = (busy_end - busy_start) / total_delta * 100 if total_delta > 0 else 0.0
+    return usage
+
+def _busy_total(times):
+    """Split a psutil cpu_times entry into (busy, total) seconds, matching psutil.cpu_percent"""
+    # Guest time is already accounted for in user/nice on Linux
+    total = sum(times) - getattr(times, 'guest', 0) - getattr(times, 'guest_nice', 0)
+    idle = times.idle + getattr(times, 'iowait', 0)
+    return total - idle, total
+
+def update_running_mean(acc: list, value: float):
+    """
+    Fold a sample into a running [count, mean] accumulator (Welford's update)
+    
+    Args:
+        acc: Accumulator list of [count, mean], updated in place
+        value: New sample
+    """
+    acc[0] += 1
+    acc[1] += (value - acc[1]) / acc[0]
+
+def _detect_cpu_topology():
+    """
+    Count physical and logical cores, preferring a single sysfs scan
+    
+    Each physical core has one distinct thread_siblings_list (the SMT threads
+    sharing it); psutil is only used where sysfs is not available.
     
     Returns:
         tuple: (physical_cores, logical_cores)
     """
     try:
+        logical_cores = os.cpu_count()
+        siblings = set()
+        for path in glob.glob('/sys/devices/system/cpu/cpu[0-9]*/topology/thread_siblings_list'):
+            with open(path) as f:
+                siblings.add(f.read().strip())
+        if logical_cores and siblings:
+            return len(siblings), logical_cores
+        
         physical_cores = psutil.cpu_count(logical=False)  # Number of physical cores
         logical_cores = psutil.cpu_count(logical=True)    # Number of logical cores (including SMT)
-        
-        # Note: AMD specific topology information could be added here
-        # This would require platform specific tools or libraries
-        
         return physical_cores, logical_cores
     except Exception as e:
         print(f"Error getting CPU topology: {e}")
         return None, None
 
-def cpu_stress_task(target_percent, cpu_affinity=None):
+# Topology does not change while the tool runs, so detect it once at import
+_PHYSICAL_CORES, _LOGICAL_CORES = _detect_cpu_topology()
+
+def get_cpu_topology():
+    """
+    Get CPU topology information including physical and logical cores
+    CCX (Core Complex) groupings are reported separately by get_ccx_groups()
+    
+    Returns:
+        tuple: (physical_cores, logical_cores)
+    """
+    return _PHYSICAL_CORES, _LOGICAL_CORES
+
+def _parse_cpu_list(cpu_list: str) -> set:
+    """Parse a sysfs CPU list such as "0-7,16-23" into a set of core numbers"""
+    cores = set()
+    for part in cpu_list.strip().split(','):
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        cores.update(range(int(first), int(last or first) + 1))
+    return cores
+
+def get_ccx_groups() -> List[List[int]]:
+    """
+    Get AMD CCX (Core Complex) groupings from the L3 cache topology
+    
+    On Zen CPUs each CCX has its own L3 cache, so cores sharing an L3 form a CCX.
+    
+    Returns:
+        List[List[int]]: Sorted core lists, one per CCX (empty if unavailable)
+    """
+    groups = set()
+    for path in glob.glob('/sys/devices/system/cpu/cpu[0-9]*/cache/index3/shared_cpu_list'):
+        try:
+            with open(path) as f:
+                groups.add(frozenset(_parse_cpu_list(f.read())))
+        except (OSError, ValueError):
+            continue
+    return sorted((sorted(group) for group in groups if group), key=lambda group: group[0])
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _burn(n):
+        """Tight multiply-add loop, vectorized by LLVM into SIMD FP instructions"""
+        s = 0.0
+        for i in range(n):
+            x = float(i)
+            s += x * x
+        return s
+else:
+    _burn = None
+
+def calibrate_burn_size(target_seconds=BURN_SLICE_SECONDS):
+    """
+    Find the _burn() iteration count that keeps the core busy for about target_seconds
+    
+    Args:
+        target_seconds (float): Desired duration of a single _burn() call
+        
+    Returns:
+        int: Iteration count to pass to _burn()
+    """
+    _burn(1)  # Load the compiled kernel (Numba cache) before timing it
+    n = 10**5
+    while True:
+        start_time = time.perf_counter()
+        _burn(n)
+        elapsed_time = time.perf_counter() - start_time
+        if elapsed_time >= target_seconds / 4:
+            return max(1, int(n * target_seconds / elapsed_time))
+        n *= 4
+
+def calibrate_work_buffer(target_seconds=BURN_SLICE_SECONDS):
+    """
+    Size the NumPy work buffer so one np.dot() takes about target_seconds
+    
+    Used when Numba is not available. The rate is measured on a small probe
+    buffer and only the final buffer is allocated, capped at MAX_WORK_ELEMENTS.
+    
+    Args:
+        target_seconds (float): Desired duration of a single np.dot() call
+        
+    Returns:
+        np.ndarray: Work buffer for the NumPy kernel
+    """
+    probe = np.arange(1, 10**5 + 1, dtype=np.float64)
+    np.dot(probe, probe)  # Warm up caches and BLAS threads
+    start_time = time.perf_counter()
+    np.dot(probe, probe)
+    elapsed_time = max(time.perf_counter() - start_time, 1e-9)
+    
+    n = min(max(int(len(probe) * target_seconds / elapsed_time), len(probe)), MAX_WORK_ELEMENTS)
+    if n == len(probe):
+        return probe
+    return np.arange(1, n + 1, dtype=np.float64)
+
+def set_cpu_affinity(core: int):
+    """
+    Pin the current process to a single CPU core with one system call
+    
+    Args:
+        core: CPU core to pin to
+    """
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {core})
+    elif sys.platform == 'win32':
+        kernel32 = ctypes.windll.kernel32
+        if not kernel32.SetProcessAffinityMask(kernel32.GetCurrentProcess(), ctypes.c_size_t(1 << core)):
+            raise ctypes.WinError()
+    else:
+        raise OSError("Setting CPU affinity is not supported on this platform")
+
+def set_numa_preferred(core: int):
+    """
+    Prefer memory from the NUMA node that owns core for later allocations
+    
+    Uses libnuma through ctypes; does nothing if libnuma is missing or the
+    system has a single NUMA node.
+    
+    Args:
+        core: CPU core whose NUMA node should be preferred
+    """
+    try:
+        libnuma = ctypes.CDLL('libnuma.so.1')
+        if libnuma.numa_available() < 0 or libnuma.numa_max_node() < 1:
+            return
+    except (OSError, AttributeError):
+        return
+    
+    node = libnuma.numa_node_of_cpu(core)
+    if node >= 0:
+        libnuma.numa_set_preferred(node)
+
+def cpu_stress_task(target_percent, cpu_affinity=None, report=None):
     """
     Function to perform CPU stress test with controlled usage
     Optimized for AMD CPU architecture
     
     Args:
         target_percent (float): Target CPU usage percentage (1-100)
-        cpu_affinity (list): List of CPU cores to use
+        cpu_affinity (int): CPU core to pin the worker to
+        report (np.ndarray): Shared [busy CPU ns, total wall ns] slot updated after every cycle (optional)
     """
     # Set CPU affinity for the current process
     if cpu_affinity is not None:
         try:
-            p = psutil.Process()
-            p.cpu_affinity([cpu_affinity])
+            set_cpu_affinity(cpu_affinity)
         except Exception as e:
             print(f"Error setting CPU affinity: {e}")
+        # Keep the work buffer on the core's local memory node
+        set_numa_preferred(cpu_affinity)
+    
+    if _burn is not None:
+        # Size the kernel so one call is a short slice of the control cycle
+        burn_size = calibrate_burn_size()
+        per_ns = burn_size / (BURN_SLICE_SECONDS * 1e9)
+    else:
+        # Allocate the work buffer after affinity is set so each core gets its own copy
+        work = calibrate_work_buffer()
+        burn_size = len(work)
+        start_ns = time.perf_counter_ns()
+        np.dot(work, work)
+        per_ns = burn_size / max(time.perf_counter_ns() - start_ns, 1)
+    
+    busy_ns = int(CONTROL_CYCLE_NS * target_percent / 100)
+    task_start = cycle_start = time.monotonic_ns()
     
     while True:
-        start_time = time.time()
-        
-        # Perform calculations (active phase)
-        # Using AMD-optimized workload pattern
-        sum(i * i for i in range(10**6))
-        
-        # Calculate elapsed time and adjust workload
-        elapsed_time = time.time() - start_time
+        # Perform calculations (active phase) until the busy deadline of this cycle
+        busy_deadline = cycle_start + busy_ns
+        # Count the CPU time this worker actually received, not wall time that
+        # includes preemption by other tasks on the core
+        busy_start = time.thread_time_ns()
+        now = time.monotonic_ns()
+        while now < busy_deadline:
+            # Trim the last slice to the busy time left so the busy phase is not
+            # rounded up by a whole slice
+            n = max(1, min(burn_size, int((busy_deadline - now) * per_ns)))
+            if _burn is not None:
+                _burn(n)
+            else:
+                # np.dot dispatches to the BLAS ddot kernel (AVX2/AVX-512 FMA on Zen)
+                np.dot(work[:n], work[:n])
+            now = time.monotonic_ns()
+        if report is not None:
+            report[0] += time.thread_time_ns() - busy_start
         
-        # Sleep to achieve target CPU usage
-        if elapsed_time < 1.0:  # Using 1 second as a control cycle
-            sleep_time = (elapsed_time * (100 - target_percent) / target_percent)
-            time.sleep(max(0, sleep_time))
+        # Sleep until the absolute end of the cycle so timing errors do not accumulate
+        cycle_start += CONTROL_CYCLE_NS
+        sleep_ns = cycle_start - time.monotonic_ns()
+        if sleep_ns > 0:
+            time.sleep(sleep_ns / 1e9)
+        elif sleep_ns < -CONTROL_CYCLE_NS:
+            # Fell more than a cycle behind (e.g. preempted); resynchronize instead of bursting
+            cycle_start = time.monotonic_ns()
+        if report is not None:
+            report[1] = time.monotonic_ns() - task_start
+
+# Slot of the current pool worker in the shared usage counters
+_pool_worker_slot = None
 
-def cpu_stress_test(duration=60, target_percent=95, cpu_cores=None, disable_smt=False, log_file=None):
+def _init_pool_worker(cpu_cores):
+    """
+    Pool initializer that pins each worker to its own core
+    
+    Args:
+        cpu_cores (list): Cores to distribute across the pool workers
+    """
+    global _pool_worker_slot
+    # Pool workers are numbered from 1 in start order
+    index = (multiprocessing.current_process()._identity[0] - 1) % len(cpu_cores)
+    _pool_worker_slot = index
+    try:
+        set_cpu_affinity(cpu_cores[index])
+    except Exception as e:
+        print(f"Error setting CPU affinity: {e}")
+    set_numa_preferred(cpu_cores[index])
+
+def _pool_stress_task(target_percent, shm_name, num_workers):
+    """Pool task: attach to the shared usage counters and run the stress loop"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    counters = np.ndarray((num_workers, 2), dtype=np.float64, buffer=shm.buf)
+    cpu_stress_task(target_percent, report=counters[_pool_worker_slot])
+
+def cpu_stress_test(duration=60, target_percent=95, cpu_cores=None, disable_smt=False, log_file=None,
+                    sample_period=0.5, ccx=None):
     """
     AMD CPU stress test with core selection and SMT control
     
     Args:
-        duration (int): Test duration in seconds after reaching target CPU usage
+        duration (int): Test duration in seconds after the warmup period
         target_percent (float): Target CPU usage percentage (1-100)
         cpu_cores (list): List of CPU cores to use (None means use all cores)
         disable_smt (bool): Whether to disable SMT (AMD's equivalent to Intel's Hyperthreading)
         log_file (str): Path to log file (optional)
+        sample_period (float): Interval between CPU usage samples in seconds
+        ccx (int): Index of the CCX whose cores to use (optional, exclusive with cpu_cores)
     """
     # Setup logging if needed
     original_stdout = sys.stdout
@@ -133,9 +613,22 @@ def cpu_stress_test(duration=60, target_percent=95, cpu_cores=None, disable_smt=
         # Validate input parameters
         if not 1 <= target_percent <= 100:
             raise ValueError("Target percentage must be between 1 and 100")
+        if sample_period <= 0:
+            raise ValueError("Sample period must be greater than 0")
         
         # Get CPU topology information
         physical_cores, logical_cores = get_cpu_topology()
+        ccx_groups = get_ccx_groups()
+        
+        # Select the cores of a single CCX to avoid cross-CCX latency
+        if ccx is not None:
+            if cpu_cores is not None:
+                raise ValueError("A CCX index cannot be combined with an explicit core list")
+            if not ccx_groups:
+                raise ValueError("CCX topology is not available on this system")
+            if not 0 <= ccx < len(ccx_groups):
+                raise ValueError(f"Invalid CCX index: {ccx}. Valid range: 0-{len(ccx_groups) - 1}")
+            cpu_cores = ccx_groups[ccx]
         
         # Determine which cores to use based on input parameters and system configuration
         if cpu_cores is None:
@@ -146,88 +639,150 @@ def cpu_stress_test(duration=60, target_percent=95, cpu_cores=None, disable_smt=
                 # Use all logical cores when SMT is enabled
                 available_cores = list(range(logical_cores))
         else:
-            # Validate specified core numbers
-            max_core = logical_cores - 1
-            invalid_cores = [core for core in cpu_cores if core > max_core or core < 0]
+            # Validate specified core numbers; duplicates collapse so no core gets two workers
+            requested_cores = set(cpu_cores)
+            invalid_cores = requested_cores - frozenset(range(logical_cores))
             if invalid_cores:
-                raise ValueError(f"Invalid core numbers: {invalid_cores}. Valid range: 0-{max_core}")
-            available_cores = cpu_cores
+                raise ValueError(f"Invalid core numbers: {sorted(invalid_cores)}. Valid range: 0-{logical_cores - 1}")
+            available_cores = sorted(requested_cores)
         
         print(f"CPU Topology: {physical_cores} physical cores, {logical_cores} logical cores")
+        for index, group in enumerate(ccx_groups):
+            print(f"CCX {index}: cores {group}")
         print(f"Using CPU cores: {available_cores}")
         print(f"Target CPU usage: {target_percent}%")
         
-        # List to store worker processes
-        processes = []
+        # Worker pool (multiprocessing fallback) and forked worker pids (POSIX)
+        pool = None
+        child_pids = []
+        stat_reader = ProcStatReader(available_cores)
+        os_cpu_times = None
         
-        # Dictionary to store running statistics
+        # Workers self-report cumulative [busy_ns, total_ns] here, one row per core
+        shm = shared_memory.SharedMemory(create=True, size=len(available_cores) * 2 * 8)
+        worker_counters = np.ndarray((len(available_cores), 2), dtype=np.float64, buffer=shm.buf)
+        worker_counters[:] = 0
+        
+        # Dictionary to store running statistics as [count, mean] accumulators
         stats = {
-            'per_core_usage': {core: [] for core in available_cores},
-            'overall_usage': []
+            'per_core': {core: [0, 0.0] for core in available_cores},
+            'overall': [0, 0.0]
         }
         
         try:
+            if _burn is not None:
+                # Compile (or load from cache) once before the workers start
+                _burn(1)
+            
             # Start a process for each selected CPU core
-            for core in available_cores:
-                p = multiprocessing.Process(
-                    target=cpu_stress_task,
-                    args=(target_percent, core)
-                )
-                p.start()
-                processes.append(p)
+            if hasattr(os, 'fork'):
+                # POSIX fast path: fork workers directly, skipping multiprocessing's
+                # pipes, sentinels and bookkeeping
+                sys.stdout.flush()
+                for slot, core in enumerate(available_cores):
+                    pid = os.fork()
+                    if pid == 0:
+                        # Child never returns into the parent's code; SIGTERM ends it
+                        try:
+                            # The shared mapping is inherited across fork
+                            cpu_stress_task(target_percent, core, worker_counters[slot])
+                        except KeyboardInterrupt:
+                            pass  # Ctrl+C reaches the whole process group; the parent reports it
+                        except BaseException:
+                            # Report the failure and exit non-zero so the parent can tell
+                            traceback.print_exc()
+                            sys.stderr.flush()
+                            os._exit(1)
+                        os._exit(0)
+                    child_pids.append(pid)
+            else:
+                # One pool worker per core, pinned by the initializer; each worker
+                # picks up exactly one never-ending task
+                ctx = multiprocessing.get_context('spawn')
+                pool = ctx.Pool(len(available_cores), initializer=_init_pool_worker,
+                                initargs=(available_cores,))
+                pool.starmap_async(_pool_stress_task,
+                                   [(target_percent, shm.name, len(available_cores))] * len(available_cores),
+                                   chunksize=1)
             
-            print("\nWaiting for CPU usage to stabilize...")
-            target_reached = False
-            start_time = None
+            print(f"\nWarming up for {WARMUP_SECONDS:g} seconds...")
+            time.sleep(WARMUP_SECONDS)
+            
+            # Prime the first snapshot; each sample reports usage since the previous one.
+            # /proc/stat is only read again at the end as a cross-check
+            cpu_times = read_worker_counters(worker_counters, available_cores)
+            os_cpu_times = stat_reader.sample()
+            start_time = time.time()
+            print(f"Starting {duration} seconds countdown...")
+            renderer = StatusRenderer(available_cores, target_percent,
+                                      logger.terminal if logger else sys.stdout, logger)
             
             while True:
                 # Monitor CPU usage for selected cores
-                cpu_percent = psutil.cpu_percent(interval=1, percpu=True)
+                time.sleep(sample_period)
+                new_cpu_times = read_worker_counters(worker_counters, available_cores)
+                cpu_percent = get_cores_usage(cpu_times, new_cpu_times)
+                cpu_times = new_cpu_times
                 current_usage = sum(cpu_percent[core] for core in available_cores) / len(available_cores)
                 
-                # Record statistics after target is reached
-                if target_reached:
-                    stats['overall_usage'].append(current_usage)
-                    for core in available_cores:
-                        stats['per_core_usage'][core].append(cpu_percent[core])
+                # Record statistics
+                update_running_mean(stats['overall'], current_usage)
+                for core in available_cores:
+                    update_running_mean(stats['per_core'][core], cpu_percent[core])
                 
-                # Start timer when target usage is reached
-                if not target_reached and current_usage >= target_percent:
-                    target_reached = True
-                    start_time = time.time()
-                    print(f"\nTarget CPU usage reached. Starting {duration} seconds countdown...")
+                # Calculate remaining time
+                elapsed = time.time() - start_time
+                remaining = max(duration - elapsed, 0)
+                
+                # Display real-time status; the final sample is rendered (and logged)
+                # too, since it is counted in the summary
+                renderer.render(cpu_percent, current_usage, remaining)
                 
                 # Check if test duration has completed
-                if target_reached and (time.time() - start_time >= duration):
+                if elapsed >= duration:
                     print("\nTest duration completed.")
                     break
                 
-                # Calculate remaining time if test has started
-                remaining = duration - (time.time() - start_time) if target_reached else None
-                
-                # Display real-time status
-                print_cpu_status(available_cores, cpu_percent, target_percent, remaining)
-                
         except KeyboardInterrupt:
             print("\nCPU stress test has been interrupted by user")
         finally:
             print("\nStopping CPU stress test...")
+            os_usage = get_cores_usage(os_cpu_times, stat_reader.sample()) if os_cpu_times else None
+            stat_reader.close()
             # Clean up processes
-            for p in processes:
-                p.terminate()
-                p.join()
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            for pid in child_pids:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            for core, pid in zip(available_cores, child_pids):
+                try:
+                    _, status = os.waitpid(pid, 0)
+                except ChildProcessError:
+                    continue
+                if os.WIFEXITED(status) and os.WEXITSTATUS(status) != 0:
+                    print(f"Error: worker for core {core} failed (exit status {os.WEXITSTATUS(status)})")
+            worker_counters = None  # Release the view before closing the mapping
+            shm.close()
+            shm.unlink()
             
             # Calculate and display average statistics
-            if stats['overall_usage']:
-                avg_overall = sum(stats['overall_usage']) / len(stats['overall_usage'])
-                print(f"\nAverage CPU Usage during test: {avg_overall:.1f}%")
+            if stats['overall'][0]:
+                print(f"\nAverage CPU Usage during test: {stats['overall'][1]:.1f}%")
                 
                 print("\nPer-core average statistics during test:")
                 for core in available_cores:
-                    if stats['per_core_usage'][core]:
-                        avg_core = sum(stats['per_core_usage'][core]) / len(stats['per_core_usage'][core])
+                    count, avg_core = stats['per_core'][core]
+                    if count:
                         print(f"Core {core}: {avg_core:.1f}%")
             
+            if os_usage:
+                os_average = sum(os_usage.values()) / len(os_usage)
+                print(f"\nOS-measured average CPU usage (cross-check): {os_average:.1f}%")
+            
             print("\nCPU stress test has been completed.")
             
     except Exception as e:
@@ -248,6 +803,10 @@ def main_func():
                       help='Specific CPU cores to use (e.g., -c 0 2 4 6)')
     parser.add_argument('--disable-smt', action='store_true',
                       help='Disable SMT (AMD equivalent to Intel Hyperthreading)')
+    parser.add_argument('--ccx', type=int, default=None,
+                      help='Use only the cores of the given CCX index (e.g., --ccx 0)')
+    parser.add_argument('--sample-period', type=float, default=0.5,
+                      help='Interval between CPU usage samples in seconds (default: 0.5)')
     parser.add_argument('-o', '--output', type=str, default=None, const='.',
                       nargs='?',
                       help='Path to save the log file')
@@ -271,7 +830,9 @@ def main_func():
             target_percent=args.target,
             cpu_cores=args.cores,
             disable_smt=args.disable_smt,
-            log_file=log_file
+            log_file=log_file,
+            sample_period=args.sample_period,
+            ccx=args.ccx
         )
     except ValueError as e:
         print(f"Error: {e}")
@@ -0,0 +1,45 @@
+"""
+Ahead-of-time build of the FMA kernel used by intel_cpu_stress_test.py
+
+Run once with Numba installed, on the machine that will run the test:
+
+    python build_kernel.py
+
+This writes a cpu_kernel extension module next to the stress test. When it is
+importable the stress test uses it instead of JIT-compiling _fma at startup.
+The module is compiled for the host CPU (AVX2/AVX-512 FMA), so rebuild it
+rather than copying it to a different machine.
+"""
+import os
+
+import numpy as np
+from numba import njit
+from numba.pycc import CC
+
+cc = CC('cpu_kernel')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+# pycc targets a generic x86-64 CPU unless told otherwise
+cc.target_cpu = 'host'
+
+@njit(fastmath=True)
+def _fma_loop(a, b, iters):
+    """Repeated float32 dot product, same loop as the JIT _fma kernel"""
+    s = np.float32(0)
+    for _ in range(iters):
+        for i in range(a.shape[0]):
+            s += a[i] * b[i]
+    return s
+
+@cc.export('fma', 'f4(f4[::1], f4[::1], i8)')
+def fma(a, b, iters):
+    """
+    Exported entry point
+    
+    cc.export takes no fastmath option, so the loop lives in a fastmath njit
+    function; that lets LLVM reassociate the reduction into vfmadd231ps.
+    """
+    return _fma_loop(a, b, iters)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Built cpu_kernel in {cc.output_dir}")
@@ -1,31 +1,106 @@
 import multiprocessing
+import numpy as np
 import psutil
 import time
 import argparse
+import hashlib
 import os
 import sys
+import threading
 from datetime import datetime
 
+# Progress bar slab; a 20-char window slid over it gives 0-20 filled segments (5% each)
+_BAR = "=" * 20 + "-" * 20
+
+# Worker kernels selectable with --kernel: FP FMA or SHA-256 (SHA-NI via OpenSSL)
+KERNELS = ('fma', 'sha')
+
+# Length of one busy/idle duty cycle in nanoseconds
+CONTROL_CYCLE_NS = 10_000_000
+
+# Interval between CPU usage samples in seconds
+SAMPLE_INTERVAL = 1.0
+
+# Interval between status line redraws in seconds (4 Hz), independent of sampling
+STATUS_PRINT_INTERVAL = 0.25
+
+# Log file buffer size in bytes
+LOG_BUFFER_SIZE = 65536
+
+# Unflushed log bytes that trigger a flush
+LOG_FLUSH_BYTES = 4096
+
+# Maximum interval between log file flushes in seconds
+LOG_FLUSH_INTERVAL = 1.0
+
+# Bytes hashed per hashlib update; small enough to stay cache resident and keep
+# the duty cycle finely divisible
+SHA_BUFFER_SIZE = 16384
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # Fall back to the pure-Python kernel
+
+try:
+    # Ahead-of-time build from build_kernel.py; nothing left to JIT-compile at startup
+    from cpu_kernel import fma as _aot_fma
+except ImportError:
+    _aot_fma = None
+
 class Logger:
     """Logger class to handle both console and file output"""
     def __init__(self, log_file):
         self.terminal = sys.stdout
-        self.log_file = open(log_file, 'w', encoding='utf-8')
+        # Binary mode: each message is encoded once and copied into a 64KB buffer
+        self.log_file = open(log_file, 'wb', buffering=LOG_BUFFER_SIZE)
+        self._since_flush = 0
+        self._last_flush = time.monotonic()
     
     def write(self, message):
         self.terminal.write(message)
-        self.log_file.write(message)
-        self.log_file.flush()
+        self.write_log(message)
+    
+    def write_log(self, message):
+        """Write a message to the log file only"""
+        data = message.encode('utf-8')
+        self.log_file.write(data)
+        
+        # Flush once LOG_FLUSH_BYTES have accumulated or LOG_FLUSH_INTERVAL has passed,
+        # not on every write
+        self._since_flush += len(data)
+        now = time.monotonic()
+        if self._since_flush > LOG_FLUSH_BYTES or now - self._last_flush > LOG_FLUSH_INTERVAL:
+            self.log_file.flush()
+            self._since_flush = 0
+            self._last_flush = now
     
     def flush(self):
         self.terminal.flush()
         self.log_file.flush()
+        self._since_flush = 0
+        self._last_flush = time.monotonic()
     
     def close(self):
         self.log_file.close()
 
+def build_status_template(cpu_cores: list) -> str:
+    """
+    Build the status line template for a fixed set of cores
+    
+    Args:
+        cpu_cores: List of CPU cores being tested
+        
+    Returns:
+        str: %-style template taking the bar, current and target usage, one value
+             per core in order, and the time suffix; the core labels are baked in
+    """
+    core_fields = " | ".join(f"Core {core}: %.1f%%" for core in cpu_cores)
+    return "\r[%s] | Current: %.1f%% | Target: %.1f%% | " + core_fields + "%s"
+
 def print_cpu_status(cpu_cores: list, cpu_percent: list, target_percent: float, 
-                    remaining_time: float = None):
+                    remaining_time: float = None, template: str = None, current_usage: float = None,
+                    stream=None):
     """
     Print current CPU status
     
@@ -34,31 +109,34 @@ def print_cpu_status(cpu_cores: list, cpu_percent: list, target_percent: float,
         cpu_percent: List of CPU utilization percentages
         target_percent: Target CPU utilization percentage
         remaining_time: Remaining test time in seconds (optional)
+        template: Precomputed build_status_template(cpu_cores) result (optional)
+        current_usage: Average usage of the tested cores, if the caller already has it (optional)
+        stream: Output stream (default: sys.stdout)
     """
-    # Calculate average usage for tested cores
-    current_usage = sum(cpu_percent[core] for core in cpu_cores) / len(cpu_cores)
-    
-    # Create progress bar
-    progress = int(current_usage / 5)  # 20 segments for 100%
-    bar = "=" * progress + "-" * (20 - progress)
+    if stream is None:
+        stream = sys.stdout
     
-    # Build status string
-    status = [
-        f"\r[{bar}]",
-        f"Current: {current_usage:.1f}%",
-        f"Target: {target_percent:.1f}%"
-    ]
+    # Calculate average usage for tested cores
+    if current_usage is None:
+        current_usage = sum(cpu_percent[core] for core in cpu_cores) / len(cpu_cores)
     
-    # Add per-core statistics
-    core_stats = [f"Core {core}: {cpu_percent[core]:.1f}%" for core in cpu_cores]
-    status.extend(core_stats)
+    # Pick progress bar (20 segments for 100%)
+    progress = min(max(int(current_usage / 5), 0), 20)
     
-    # Add remaining time if provided
-    if remaining_time is not None:
-        status.append(f"Time: {int(remaining_time)}s")
+    if template is None:
+        template = build_status_template(cpu_cores)
     
-    # Print status
-    print(" | ".join(status), end="")
+    # Fill in only the numeric fields with one C-level % pass; remaining time is shown if provided
+    stream.write(template % (
+        _BAR[20 - progress:40 - progress],
+        current_usage,
+        target_percent,
+        *[cpu_percent[core] for core in cpu_cores],
+        f" | Time: {int(remaining_time)}s" if remaining_time is not None else ""
+    ))
+    # The line has no newline, so flush the terminal explicitly once per tick; a
+    # Logger flushes its file on its own size/time cadence
+    getattr(stream, 'terminal', stream).flush()
 
 def get_cpu_topology():
     """
@@ -74,37 +152,245 @@ def get_cpu_topology():
         print(f"Error getting CPU topology: {e}")
         return None, None
 
-def cpu_stress_task(target_percent, cpu_affinity=None):
+def get_allowed_cores(logical_cores: int):
+    """
+    Get the cores this process is allowed to run on
+    
+    On Linux the affinity mask reflects cgroup cpusets (Docker, Kubernetes,
+    systemd) and taskset, which psutil.cpu_count() does not.
+    
+    Args:
+        logical_cores (int): Logical core count, used when no affinity API exists
+        
+    Returns:
+        list: Sorted core numbers
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    try:
+        return sorted(psutil.Process().cpu_affinity())
+    except (AttributeError, psutil.Error):
+        return list(range(logical_cores))
+
+def _read_proc_stat():
+    """
+    Read per-CPU time counters from /proc/stat in one pass
+    
+    Returns:
+        np.ndarray: int64 array of shape (ncpu, 7) holding user, nice, system,
+                    idle, iowait, irq and softirq jiffies, indexed by CPU number
+    """
+    rows = {}
+    with open('/proc/stat', 'rb') as f:
+        for line in f:
+            # Per-CPU lines come first, right after the aggregate "cpu" line
+            if not line.startswith(b'cpu'):
+                break
+            fields = line.split()
+            if fields[0] != b'cpu':
+                rows[int(fields[0][3:])] = [int(value) for value in fields[1:8]]
+    
+    counters = np.zeros((max(rows) + 1, 7), dtype=np.int64)
+    for cpu, values in rows.items():
+        counters[cpu] = values
+    return counters
+
+def cpu_times_snapshot():
+    """
+    Start a per-CPU utilization measurement without blocking
+    
+    On Linux this reads the /proc/stat counters; elsewhere it resets psutil's
+    per-CPU baseline.
+    
+    Returns:
+        Snapshot to pass to get_cpu_percent()
+    """
+    if not os.path.exists('/proc/stat'):
+        psutil.cpu_percent(interval=None, percpu=True)
+        return None
+    return _read_proc_stat()
+
+def get_cpu_percent(snapshot):
+    """
+    Measure per-CPU utilization since a snapshot
+    
+    Args:
+        snapshot: Result of cpu_times_snapshot()
+        
+    Returns:
+        Per-CPU utilization percentages, indexed by CPU number
+    """
+    if snapshot is None:
+        return psutil.cpu_percent(interval=None, percpu=True)
+    
+    delta = _read_proc_stat() - snapshot
+    
+    total = delta.sum(axis=1)
+    busy = total - delta[:, 3] - delta[:, 4]  # Everything except idle and iowait
+    return np.where(total > 0, busy * 100.0 / np.maximum(total, 1), 0.0)
+
+if _aot_fma is not None:
+    _fma = _aot_fma
+elif njit is not None:
+    @njit('float32(float32[::1], float32[::1], int64)', fastmath=True, cache=True, boundscheck=False,
+          nogil=True)
+    def _fma(a, b, iters):
+        """Repeated float32 dot product; LLVM lowers the inner loop to vfmadd231ps on AVX2/AVX-512"""
+        s = np.float32(0)
+        for _ in range(iters):
+            for i in range(a.shape[0]):
+                s += a[i] * b[i]
+        return s
+else:
+    # Dot products per BLAS call in the NumPy fallback
+    _FMA_BLOCK = 64
+    _fma_tile = None
+    _fma_out = np.empty(_FMA_BLOCK, dtype=np.float32)
+    
+    def _fma(a, b, iters):
+        """
+        NumPy fallback used when Numba is not installed
+        
+        Stacks _FMA_BLOCK copies of a into a tile allocated once per process, so
+        each np.dot is a single sgemv covering _FMA_BLOCK dot products and writes
+        into a preallocated output instead of allocating per iteration.
+        """
+        global _fma_tile
+        if _fma_tile is None or _fma_tile.shape[1] != a.shape[0]:
+            _fma_tile = np.tile(a, (_FMA_BLOCK, 1))
+        
+        s = np.float32(0)
+        for start in range(0, iters, _FMA_BLOCK):
+            rows = min(_FMA_BLOCK, iters - start)
+            np.dot(_fma_tile[:rows], b, out=_fma_out[:rows])
+            s += _fma_out[:rows].sum()
+        return s
+
+def _sha(buf, iters):
+    """
+    Hash buf iters times with SHA-256
+    
+    OpenSSL dispatches to the SHA-NI instructions when the CPU has them. The loop
+    itself runs in Python and retakes the GIL between updates, so the SHA kernel
+    always runs in process workers.
+    """
+    h = hashlib.sha256()
+    for _ in range(iters):
+        h.update(buf)
+    return h.digest()
+
+def get_cpu_flags():
+    """
+    Read the CPU feature flags reported by the kernel
+    
+    Returns:
+        set: Flags from the first 'flags' line of /proc/cpuinfo (empty if unavailable)
+    """
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('flags'):
+                    return set(line.split(':', 1)[1].split())
+    except OSError:
+        pass
+    return set()
+
+def calibrate_kernel_rate(kernel, operands):
+    """
+    Measure how many kernel iterations the current core completes per second
+    
+    Args:
+        kernel (callable): Worker kernel, called as kernel(*operands, iters)
+        operands (tuple): Buffers passed to the kernel
+        
+    Returns:
+        float: Kernel iterations per second
+    """
+    iters = 16
+    while True:
+        start_time = time.perf_counter()
+        kernel(*operands, iters)
+        elapsed_time = time.perf_counter() - start_time
+        # Time at least 50ms so timer resolution does not skew the rate
+        if elapsed_time >= 0.05:
+            return iters / elapsed_time
+        iters *= 2
+
+def set_cpu_affinity(core: int):
+    """
+    Pin the calling thread (Linux) or process to a single CPU core
+    
+    os.sched_setaffinity is a single system call; psutil.Process() is only
+    constructed on platforms without it (e.g. Windows), since it opens several
+    /proc/self files just to exist.
+    
+    Args:
+        core: CPU core to pin to
+    """
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {core})
+    else:
+        psutil.Process().cpu_affinity([core])
+
+def cpu_stress_task(target_percent, cpu_affinity=None, realtime=False, stop_event=None, kernel='fma'):
     """
     Function to perform CPU stress test with controlled usage
     
+    Runs either in its own process or, when the kernel releases the GIL, as a
+    thread; affinity and scheduling calls then apply to the calling thread only.
+    
     Args:
         target_percent (float): Target CPU usage percentage (1-100)
-        cpu_affinity (list): List of CPU cores to use
+        cpu_affinity (int): CPU core to pin the worker to
+        realtime (bool): Whether to run the worker under SCHED_FIFO
+        stop_event (threading.Event): Event that ends the loop when set (thread workers only)
+        kernel (str): Worker kernel, one of KERNELS
     """
-    # Set CPU affinity for the current process
+    # Pin before touching any memory so the worker never migrates and its
+    # buffers are first-touched on the local NUMA node
     if cpu_affinity is not None:
         try:
-            p = psutil.Process()
-            p.cpu_affinity([cpu_affinity])
+            set_cpu_affinity(cpu_affinity)
         except Exception as e:
             print(f"Error setting CPU affinity: {e}")
     
-    while True:
-        start_time = time.time()
-        
+    # Optionally keep the worker from being preempted by normal tasks
+    if realtime:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(1))
+        except (AttributeError, PermissionError) as e:
+            print(f"Error enabling SCHED_FIFO: {e}")
+    
+    # Preallocate the kernel operands once; both buffers stay resident in L1
+    if kernel == 'sha':
+        work, operands = _sha, (bytes(SHA_BUFFER_SIZE),)
+    else:
+        work, operands = _fma, (np.ones(4096, dtype=np.float32), np.ones(4096, dtype=np.float32))
+    
+    # Precompute the duty cycle once: the busy phase of each control cycle is a
+    # single kernel call of busy_iters iterations, with no clock reads inside it
+    busy_fraction = target_percent / 100
+    busy_iters = max(1, int(calibrate_kernel_rate(work, operands) * busy_fraction * CONTROL_CYCLE_NS / 1e9))
+    
+    cycle_start = time.monotonic_ns()
+    while stop_event is None or not stop_event.is_set():
         # Perform calculations (active phase)
-        sum(i * i for i in range(10**6))
-        
-        # Calculate elapsed time and adjust workload
-        elapsed_time = time.time() - start_time
+        work(*operands, busy_iters)
         
-        # Sleep to achieve target CPU usage
-        if elapsed_time < 1.0:  # Using 1 second as a control cycle
-            sleep_time = (elapsed_time * (100 - target_percent) / target_percent)
-            time.sleep(max(0, sleep_time))
+        # Sleep until the absolute end of the cycle so timing errors do not accumulate
+        cycle_start += CONTROL_CYCLE_NS
+        sleep_ns = cycle_start - time.monotonic_ns()
+        if sleep_ns > 0:
+            if stop_event is not None:
+                stop_event.wait(sleep_ns / 1e9)
+            else:
+                time.sleep(sleep_ns / 1e9)
+        elif sleep_ns < -CONTROL_CYCLE_NS:
+            # Fell more than a cycle behind (e.g. preempted); resynchronize instead of bursting
+            cycle_start = time.monotonic_ns()
 
-def cpu_stress_test(duration=60, target_percent=95, cpu_cores=None, disable_hyperth=False, log_file=None):
+def cpu_stress_test(duration=60, target_percent=95, cpu_cores=None, disable_hyperth=False, log_file=None,
+                    realtime=False, kernel='fma'):
     """
     CPU stress test with core selection and hyperthreading control
     
@@ -114,6 +400,8 @@ def cpu_stress_test(duration=60, target_percent=95, cpu_cores=None, disable_hype
         cpu_cores (list): List of CPU cores to use (None means use all cores)
         disable_hyperth (bool): Whether to disable hyperthreading
         log_file (str): Path to log file (optional)
+        realtime (bool): Run workers under SCHED_FIFO (Linux, needs root or CAP_SYS_NICE)
+        kernel (str): Worker kernel, one of KERNELS
     """
     # Setup logging if needed
     original_stdout = sys.stdout
@@ -125,100 +413,161 @@ def cpu_stress_test(duration=60, target_percent=95, cpu_cores=None, disable_hype
         # Validate input parameters
         if not 1 <= target_percent <= 100:
             raise ValueError("Target percentage must be between 1 and 100")
+        if kernel not in KERNELS:
+            raise ValueError(f"Unknown kernel: {kernel}. Choose from {', '.join(KERNELS)}")
         
         # Get CPU topology information
         physical_cores, logical_cores = get_cpu_topology()
         
+        # Cores the scheduler will actually let us use (cpuset/taskset aware)
+        allowed_cores = get_allowed_cores(logical_cores)
+        
         # Determine which cores to use based on input parameters and system configuration
         if cpu_cores is None:
             if disable_hyperth:
                 # Use only physical cores when hyperthreading is disabled
-                available_cores = list(range(physical_cores))
+                available_cores = [core for core in allowed_cores if core < physical_cores]
             else:
                 # Use all logical cores when hyperthreading is enabled
-                available_cores = list(range(logical_cores))
+                available_cores = allowed_cores
         else:
-            # Validate specified core numbers
-            max_core = logical_cores - 1
-            invalid_cores = [core for core in cpu_cores if core > max_core or core < 0]
+            # Validate specified core numbers against the allowed set
+            allowed = set(allowed_cores)
+            invalid_cores = [core for core in cpu_cores if core not in allowed]
             if invalid_cores:
-                raise ValueError(f"Invalid core numbers: {invalid_cores}. Valid range: 0-{max_core}")
+                raise ValueError(f"Invalid core numbers: {invalid_cores}. Allowed cores: {allowed_cores}")
             available_cores = cpu_cores
         
+        if not available_cores:
+            raise ValueError("No allowed CPU cores to run on")
+        
         print(f"CPU Topology: {physical_cores} physical cores, {logical_cores} logical cores")
         print(f"Using CPU cores: {available_cores}")
         print(f"Target CPU usage: {target_percent}%")
+        print(f"Worker kernel: {kernel}")
+        if kernel == 'sha' and 'sha_ni' not in get_cpu_flags():
+            print("Warning: CPU does not report sha_ni; the SHA kernel will run in software")
         
-        # List to store worker processes
-        processes = []
+        # Status line layout is fixed once the cores are known
+        status_template = build_status_template(available_cores)
         
-        # Dictionary to store running statistics
-        stats = {
-            'per_core_usage': {core: [] for core in available_cores},
-            'overall_usage': []
-        }
+        # The nogil Numba kernel lets one process drive every core with threads, as
+        # long as each thread can be pinned on its own; otherwise use processes (the
+        # AOT kernel and the Python-level SHA loop hold the GIL)
+        use_threads = (kernel == 'fma' and njit is not None and _aot_fma is None
+                       and hasattr(os, 'sched_setaffinity'))
+        stop_event = threading.Event()
+        
+        # List to store worker threads or processes
+        workers = []
+        
+        # Per-sample usage of each tested core, one row per second of the test; float16
+        # keeps well under 0.1% resolution for 0-100% and halves long-test memory
+        max_samples = duration + 5
+        usage = np.empty((max_samples, len(available_cores)), dtype=np.float16)
+        num_samples = 0
         
         try:
-            # Start a process for each selected CPU core
+            # Start a worker for each selected CPU core
             for core in available_cores:
-                p = multiprocessing.Process(
-                    target=cpu_stress_task,
-                    args=(target_percent, core)
-                )
-                p.start()
-                processes.append(p)
+                if use_threads:
+                    worker = threading.Thread(
+                        target=cpu_stress_task,
+                        args=(target_percent, core, realtime, stop_event, kernel),
+                        daemon=True
+                    )
+                else:
+                    worker = multiprocessing.Process(
+                        target=cpu_stress_task,
+                        args=(target_percent, core, realtime, None, kernel)
+                    )
+                worker.start()
+                workers.append(worker)
             
             print("\nWaiting for CPU usage to stabilize...")
             target_reached = False
             start_time = None
             
+            # Loop invariants for the per-second average
+            ncores = len(available_cores)
+            inv_n = 1.0 / ncores
+            core_tuple = tuple(available_cores)
+            terminal = logger.terminal if logger else sys.stdout
+            
+            # Sample every SAMPLE_INTERVAL, but redraw every STATUS_PRINT_INTERVAL so
+            # the countdown keeps moving between samples
+            snapshot = cpu_times_snapshot()
+            next_sample = time.monotonic() + SAMPLE_INTERVAL
+            cpu_percent = None
+            
             while True:
-                # Monitor CPU usage for selected cores
-                cpu_percent = psutil.cpu_percent(interval=1, percpu=True)
-                current_usage = sum(cpu_percent[core] for core in available_cores) / len(available_cores)
-                
-                # Record statistics after target is reached
-                if target_reached:
-                    stats['overall_usage'].append(current_usage)
-                    for core in available_cores:
-                        stats['per_core_usage'][core].append(cpu_percent[core])
+                time.sleep(max(min(STATUS_PRINT_INTERVAL, next_sample - time.monotonic()), 0))
+                now = time.monotonic()
                 
-                # Start timer when target usage is reached
-                if not target_reached and current_usage >= target_percent:
-                    target_reached = True
-                    start_time = time.time()
-                    print(f"\nTarget CPU usage reached. Starting {duration} seconds countdown...")
+                new_sample = now >= next_sample
+                if new_sample:
+                    # Monitor CPU usage for selected cores
+                    cpu_percent = get_cpu_percent(snapshot)
+                    snapshot = cpu_times_snapshot()
+                    current_usage = sum(cpu_percent[core] for core in core_tuple) * inv_n
+                    
+                    # Record statistics after target is reached
+                    if target_reached:
+                        if num_samples == len(usage):
+                            usage = np.concatenate([usage, np.empty_like(usage)])
+                        usage[num_samples] = [cpu_percent[core] for core in core_tuple]
+                        num_samples += 1
+                    
+                    # Start timer when target usage is reached
+                    if not target_reached and current_usage >= target_percent:
+                        target_reached = True
+                        start_time = now
+                        print(f"\nTarget CPU usage reached. Starting {duration} seconds countdown...")
+                    
+                    # Check if test duration has completed
+                    if target_reached and now - start_time >= duration:
+                        print("\nTest duration completed.")
+                        break
+                    
+                    # The last sample is cut to the time left so the test does not run
+                    # past its duration
+                    next_sample = now + SAMPLE_INTERVAL
+                    if target_reached:
+                        next_sample = min(next_sample, max(start_time + duration, now + 0.01))
                 
-                # Check if test duration has completed
-                if target_reached and (time.time() - start_time >= duration):
-                    print("\nTest duration completed.")
-                    break
+                if cpu_percent is None:
+                    continue
                 
                 # Calculate remaining time if test has started
-                remaining = duration - (time.time() - start_time) if target_reached else None
+                remaining = duration - (now - start_time) if target_reached else None
                 
-                # Display real-time status
-                print_cpu_status(available_cores, cpu_percent, target_percent, remaining)
+                # Display real-time status; redraws between samples only go to the
+                # terminal, so the log gets one line per sample
+                print_cpu_status(core_tuple, cpu_percent, target_percent, remaining,
+                                 template=status_template, current_usage=current_usage,
+                                 stream=sys.stdout if new_sample else terminal)
                 
         except KeyboardInterrupt:
             print("\nCPU stress test has been interrupted by user")
         finally:
             print("\nStopping CPU stress test...")
-            # Clean up processes
-            for p in processes:
-                p.terminate()
-                p.join()
+            # Clean up workers
+            stop_event.set()
+            for worker in workers:
+                if isinstance(worker, multiprocessing.Process):
+                    worker.terminate()
+                worker.join()
             
             # Calculate and display average statistics
-            if stats['overall_usage']:
-                avg_overall = sum(stats['overall_usage']) / len(stats['overall_usage'])
-                print(f"\nAverage CPU Usage during test: {avg_overall:.1f}%")
+            if num_samples:
+                # One column reduction over the contiguous sample block; every core has
+                # the same sample count, so the overall mean is the mean of the columns
+                means = usage[:num_samples].mean(axis=0, dtype=np.float32)
+                print(f"\nAverage CPU Usage during test: {means.mean():.1f}%")
                 
                 print("\nPer-core average statistics during test:")
-                for core in available_cores:
-                    if stats['per_core_usage'][core]:
-                        avg_core = sum(stats['per_core_usage'][core]) / len(stats['per_core_usage'][core])
-                        print(f"Core {core}: {avg_core:.1f}%")
+                for i, core in enumerate(available_cores):
+                    print(f"Core {core}: {means[i]:.1f}%")
             
             print("\nCPU stress test has been completed.")
             
@@ -240,6 +589,10 @@ def main_func():
                       help='Specific CPU cores to use (e.g., -c 0 2 4 6)')
     parser.add_argument('--disable-ht', action='store_true',
                       help='Disable hyperthreading (use only physical cores)')
+    parser.add_argument('--realtime', action='store_true',
+                      help='Run workers under SCHED_FIFO (Linux, requires root or CAP_SYS_NICE)')
+    parser.add_argument('--kernel', choices=KERNELS, default='fma',
+                      help='Worker kernel: fma (FP FMA) or sha (SHA-256, uses SHA-NI when present) (default: fma)')
     parser.add_argument('-o', '--output', type=str, default=None, const='.',
                       nargs='?',
                       help='Path to save the log file')
@@ -256,6 +609,9 @@ def main_func():
                                filename)
         print(f"Output will be saved to: {os.path.abspath(log_file)}")
     
+    # Compile the kernel (or load it from cache) once before the workers fork
+    _fma(np.ones(1, dtype=np.float32), np.ones(1, dtype=np.float32), 1)
+    
     try:
         # Run the stress test with provided parameters
         cpu_stress_test(
@@ -263,7 +619,9 @@ def main_func():
             target_percent=args.target,
             cpu_cores=args.cores,
             disable_hyperth=args.disable_ht,
-            log_file=log_file
+            log_file=log_file,
+            realtime=args.realtime,
+            kernel=args.kernel
         )
     except ValueError as e:
         print(f"Error: {e}")